@@ -1,10 +1,14 @@
+import atexit
 import base64
 import io
 import logging
 import math
 import os
 import random
+import threading
+from collections import deque
 from dataclasses import asdict, dataclass
+from multiprocessing import Pool
 from typing import Tuple, List
 import re
 import hashlib
@@ -12,7 +16,7 @@ import hashlib
 import numpy as np
 from PIL import Image, ImageDraw
 from dotenv import load_dotenv
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, stream_with_context
 from flask_cors import CORS
 
 # Optional deps (IPFS, PDF)
@@ -28,23 +32,15 @@ except Exception:  # pragma: no cover - optional
     letter = None  # type: ignore
     canvas = None  # type: ignore
 
+from logsetup import PER_ITEM, init_worker, setup_logging, worker_queue
 from stamps import StampService
 import json
 
 
 load_dotenv()
 
-# Logging
-os.makedirs("logs", exist_ok=True)
-log_level = os.getenv("LOG_LEVEL", "INFO").upper()
-logging.basicConfig(
-    level=getattr(logging, log_level, logging.INFO),
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler("logs/app.log"),
-        logging.StreamHandler()
-    ],
-)
+# Logging (queue-based; file/stderr I/O runs on a listener thread)
+setup_logging()
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
@@ -60,6 +56,10 @@ CREATOR_TIP_SATS = int(float(os.getenv("CREATOR_TIP_BTC", "0.00021")) * 100_000_
 MAX_FLOCKS = int(os.getenv("MAX_FLOCKS", "10000"))
 TX_BUILDER_URL = os.getenv("TX_BUILDER_URL", "")
 FEE_RATE_SAT_VB = int(os.getenv("FEE_RATE_SAT_VB", "5"))
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "5000"))
+BULK_WORKERS = int(os.getenv("BULK_WORKERS", str(os.cpu_count() or 2)))
+BULK_CHUNKSIZE = int(os.getenv("BULK_CHUNKSIZE", "4"))
+BULK_WINDOW = int(os.getenv("BULK_WINDOW", str(BULK_WORKERS)))
 
 stamp_service = StampService(private_key=WALLET_PRIVATE_KEY, network=BITCOIN_NETWORK)
 
@@ -234,7 +234,7 @@ def generate_hexa_flock(seed: int = 42, size: int = 64):
         "size": 24,
         "palette": _PALETTE,
     }
-    logger.info(f"Generated sheep seed={seed}")
+    logger.info("Generated sheep seed=%d", seed, extra=PER_ITEM)
     return img_bytes, metadata
 
 
@@ -343,6 +343,120 @@ def api_generate():
         return jsonify({"error": "Internal error"}), 500
 
 
+def _generate_line(item: tuple) -> str:
+    """Render one bulk item and return its NDJSON line.
+
+    `item` is (index, txid, seed); txid is None for seed-range requests.
+    Failures become an error entry for that item only.
+    """
+    index, txid, seed = item
+    entry: dict = {"index": index}
+    if txid is not None:
+        entry["txid"] = txid
+    try:
+        if txid is not None:
+            seed = _txid_to_seed(txid)
+        _, meta = generate_hexa_flock(seed)
+        if txid is not None:
+            meta["source_txid"] = txid
+        entry["metadata"] = meta
+        entry["image_base64"] = meta["image_uri"].split(",", 1)[1]
+    except ValueError as e:
+        entry["error"] = str(e)
+    except Exception as e:
+        logger.exception("bulk item %d failed: %s", index, e)
+        entry["error"] = "Internal error"
+    return json.dumps(entry) + "\n"
+
+
+def _generate_chunk(chunk: list) -> str:
+    return "".join(_generate_line(item) for item in chunk)
+
+
+_bulk_pool = None
+_bulk_pool_lock = threading.Lock()
+
+
+def _get_bulk_pool():
+    """Lazily start the worker pool shared by /generate_bulk requests."""
+    global _bulk_pool
+    with _bulk_pool_lock:
+        if _bulk_pool is None:
+            _bulk_pool = Pool(processes=BULK_WORKERS, initializer=init_worker, initargs=(worker_queue(),))
+            atexit.register(_shutdown_bulk_pool)
+        return _bulk_pool
+
+
+def _shutdown_bulk_pool() -> None:
+    global _bulk_pool
+    with _bulk_pool_lock:
+        if _bulk_pool is not None:
+            _bulk_pool.terminate()
+            _bulk_pool.join()
+            _bulk_pool = None
+
+
+def _parse_bulk_items(payload: dict) -> list:
+    """Turn a bulk request body into (index, txid, seed) work items."""
+    if not isinstance(payload, dict):
+        raise ValueError("Request body must be a JSON object")
+    txids = payload.get("txids")
+    if txids is not None:
+        if not isinstance(txids, list):
+            raise ValueError("txids must be a list")
+        if len(txids) > BULK_MAX_ITEMS:
+            raise ValueError(f"At most {BULK_MAX_ITEMS} items per request")
+        return [(i, str(t), None) for i, t in enumerate(txids)]
+
+    start = payload.get("seed_start")
+    count = payload.get("count")
+    if not isinstance(start, int) or not isinstance(count, int):
+        raise ValueError("txids or integer seed_start and count are required")
+    if start < 1 or count < 0:
+        raise ValueError("seed_start must be positive and count non-negative")
+    if count > BULK_MAX_ITEMS:
+        raise ValueError(f"At most {BULK_MAX_ITEMS} items per request")
+    return [(i, None, start + i) for i in range(count)]
+
+
+@app.route("/generate_bulk", methods=["POST"])
+def api_generate_bulk():
+    """Generate many sheep, streamed back as NDJSON in request order.
+
+    Body: {"txids": [...]} or {"seed_start": int, "count": int}. Each line
+    carries the item's index and either metadata/image_base64 or an error.
+    """
+    try:
+        payload = request.get_json(force=True) or {}
+        items = _parse_bulk_items(payload)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        logger.exception("/generate_bulk failed: %s", e)
+        return jsonify({"error": "Internal error"}), 500
+
+    def stream():
+        # At most BULK_WINDOW chunks per request are queued on the shared
+        # pool, and more are submitted only as the client reads, so a slow
+        # or vanished client can't monopolise the workers or buffer output.
+        pool = _get_bulk_pool()
+        chunks = (items[i:i + BULK_CHUNKSIZE] for i in range(0, len(items), BULK_CHUNKSIZE))
+        pending: deque = deque()
+        try:
+            for chunk in chunks:
+                pending.append(pool.apply_async(_generate_chunk, (chunk,)))
+                if len(pending) >= BULK_WINDOW:
+                    yield pending.popleft().get()
+            while pending:
+                yield pending.popleft().get()
+        finally:
+            # On disconnect (GeneratorExit) stop submitting; in-flight chunks
+            # finish and their results are dropped.
+            pending.clear()
+
+    return Response(stream_with_context(stream()), mimetype="application/x-ndjson")
+
+
 @app.route("/mint", methods=["POST"])
 def api_mint():
     try:
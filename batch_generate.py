@@ -2,54 +2,98 @@ import argparse
 import json
 import logging
 import os
+import time
 from multiprocessing import Pool
 
 from backend import generate_hexa_flock, stamp_service
+from logsetup import PER_ITEM, init_worker, stop_logging, worker_queue
 
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-os.makedirs("flocks", exist_ok=True)
 
-
-def process_seed(seed: int) -> int:
+def render_seed(seed: int) -> tuple[int, dict]:
+    """Worker step: render one sheep, write its PNG and return its stamp payload."""
     img_bytes, meta = generate_hexa_flock(seed)
+    with open(f"flocks/flock_{seed}.png", "wb") as f:
+        f.write(img_bytes.getvalue())
+
     stamp_data = {
         "name": f"HexaFlock #{seed}",
         "description": meta["description"],
         "image_base64": meta["image_uri"].split(",", 1)[1],
         "attributes": {**meta["traits"], "seed": seed},
     }
-    tx_hash = stamp_service.create_stamp(stamp_data)
-
-    with open(f"flocks/flock_{seed}.png", "wb") as f:
-        f.write(img_bytes.getvalue())
-
-    with open(f"flocks/meta_{seed}.json", "w") as f:
-        json.dump({**meta, "tx_hash": tx_hash}, f, indent=2)
-
-    logger.info(f"Processed seed={seed} tx={tx_hash}")
-    return seed
+    return seed, {"meta": meta, "stamp_data": stamp_data}
+
+
+def stamp_rendered(rendered: list, batch_size: int | None = None, max_concurrency: int | None = None) -> int:
+    """Stamp a group of rendered seeds in one batch, write their metadata and return the failure count."""
+    results = stamp_service.create_stamps(
+        [item["stamp_data"] for _, item in rendered], batch_size=batch_size, max_concurrency=max_concurrency
+    )
+    failed = 0
+    for (seed, item), result in zip(rendered, results):
+        record = {**item["meta"], "tx_hash": result.tx_hash}
+        if not result.ok:
+            failed += 1
+            record["stamp_error"] = result.error
+            logger.warning("Stamping failed seed=%d: %s", seed, result.error)
+        else:
+            logger.info("Processed seed=%d tx=%s", seed, result.tx_hash, extra=PER_ITEM)
+        with open(f"flocks/meta_{seed}.json", "w") as f:
+            json.dump(record, f, indent=2)
+    return failed
 
 
 def main():
     parser = argparse.ArgumentParser(description="Batch generate and (mock) stamp HexaFlocks")
     parser.add_argument("--num", type=int, default=10, help="Number of flocks to generate")
     parser.add_argument("--processes", type=int, default=2, help="Parallel processes for generation")
+    parser.add_argument("--batch-size", type=int, default=stamp_service.batch_size, help="Stamps submitted per backend call")
+    parser.add_argument("--stamp-concurrency", type=int, default=stamp_service.max_concurrency, help="Stamp batches in flight at once")
     args = parser.parse_args()
 
+    os.makedirs("flocks", exist_ok=True)
+
     seeds = list(range(1, args.num + 1))
+    # Stamp in groups of several backend batches so all concurrency slots fill
+    group_size = args.batch_size * args.stamp_concurrency
+    started = time.perf_counter()
+    failed = 0
+    pending: list = []
+
+    def flush() -> None:
+        nonlocal failed
+        if pending:
+            failed += stamp_rendered(pending, args.batch_size, args.stamp_concurrency)
+            pending.clear()
+
     if args.processes <= 1:
         for s in seeds:
-            process_seed(s)
+            pending.append(render_seed(s))
+            if len(pending) >= group_size:
+                flush()
     else:
-        with Pool(processes=args.processes) as pool:
-            pool.map(process_seed, seeds)
-
-    logger.info("Batch complete: %d flocks", args.num)
+        # Workers only render; the parent owns the StampService and batches
+        # submissions. Workers log through a shared queue into one log.
+        log_queue = worker_queue()
+        with Pool(processes=args.processes, initializer=init_worker, initargs=(log_queue,)) as pool:
+            for rendered in pool.imap(render_seed, seeds):
+                pending.append(rendered)
+                if len(pending) >= group_size:
+                    flush()
+            pool.close()
+            pool.join()
+    flush()
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        "Batch complete: %d flocks, %d stamp failures in %.2fs (%.1f flocks/s)",
+        args.num, failed, elapsed, args.num / elapsed if elapsed else 0.0,
+    )
+    stop_logging()
 
 
 if __name__ == "__main__":
     main()
-
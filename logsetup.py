@@ -0,0 +1,137 @@
+import atexit
+import itertools
+import logging
+import multiprocessing
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import List
+
+LOG_PATH = os.path.join("logs", "app.log")
+LOG_FORMAT = "%(asctime)s - %(processName)s - %(levelname)s - %(message)s"
+
+# Pass as `extra=PER_ITEM` on messages emitted once per sheep/stamp so they
+# can be sampled down during large batch runs.
+PER_ITEM = {"per_item": True}
+
+_handlers: List[logging.Handler] = []
+_listeners: List[QueueListener] = []
+# Set by init_worker; pool workers must keep logging to the parent's queue
+# even when an import (e.g. `backend` under spawn) calls setup_logging().
+_is_worker = False
+
+
+class ItemSampler(logging.Filter):
+    """Let through one in `every` per-item records; everything else passes.
+
+    Warnings and above are never dropped.
+    """
+
+    def __init__(self, every: int = 1) -> None:
+        super().__init__()
+        self.every = max(1, every)
+        self._counter = itertools.count()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not getattr(record, "per_item", False):
+            return True
+        return next(self._counter) % self.every == 0
+
+
+class _LocalQueueHandler(QueueHandler):
+    """QueueHandler for an in-process queue.
+
+    The stock handler formats the message before enqueueing so the record can
+    be pickled; within one process that is unnecessary, so formatting is left
+    to the listener thread and the caller only pays for the enqueue.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _sampler() -> ItemSampler:
+    return ItemSampler(int(os.getenv("LOG_ITEM_SAMPLE", "1")))
+
+
+def _start_listener(q) -> QueueListener:
+    listener = QueueListener(q, *_handlers, respect_handler_level=True)
+    listener.start()
+    _listeners.append(listener)
+    return listener
+
+
+def setup_logging(level: str | None = None, log_path: str = LOG_PATH) -> None:
+    """Route the root logger through a queue drained by a background thread.
+
+    The listener owns the rotating file handler and stderr handler. Calling
+    this again, or in a process set up by `init_worker`, is a no-op.
+    """
+    if _listeners or _is_worker:
+        return
+    level = (level or os.getenv("LOG_LEVEL", "INFO")).upper()
+    os.makedirs(os.path.dirname(log_path) or ".", exist_ok=True)
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    _handlers.clear()
+    file_handler = RotatingFileHandler(
+        log_path,
+        maxBytes=int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024))),
+        backupCount=int(os.getenv("LOG_BACKUP_COUNT", "5")),
+    )
+    for h in (file_handler, logging.StreamHandler()):
+        h.setFormatter(formatter)
+        _handlers.append(h)
+
+    q: queue.SimpleQueue = queue.SimpleQueue()
+    handler = _LocalQueueHandler(q)
+    handler.addFilter(_sampler())
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(getattr(logging, level, logging.INFO))
+
+    _start_listener(q)
+    atexit.register(stop_logging)
+
+
+def worker_queue(ctx=None):
+    """Return a multiprocessing queue whose records land in the main log.
+
+    Pass it to `init_worker` as a Pool initializer so every worker writes to
+    the same handlers, serialized through one listener in the parent. Pass
+    `ctx` when the pool uses a non-default multiprocessing context.
+    """
+    setup_logging()
+    q = (ctx or multiprocessing).Queue()
+    _start_listener(q)
+    return q
+
+
+def init_worker(q) -> None:
+    """Pool initializer: replace inherited handlers with a QueueHandler on `q`.
+
+    Any listener/file handler this process already set up (spawned workers
+    re-import the parent's main module) is shut down, and later
+    `setup_logging()` calls become no-ops, so only the parent writes the log.
+    A forked worker also inherits the parent's listener on `q`; stopping it
+    would put the shutdown sentinel on the shared queue and kill the
+    parent's listener, so that one is only dropped.
+    """
+    global _is_worker
+    _is_worker = True
+    for listener in _listeners:
+        if listener.queue is not q:
+            listener.stop()
+    _listeners.clear()
+    for h in _handlers:
+        h.close()
+    _handlers.clear()
+    handler = QueueHandler(q)
+    handler.addFilter(_sampler())
+    logging.getLogger().handlers = [handler]
+
+
+def stop_logging() -> None:
+    """Drain and stop all listeners, flushing pending records."""
+    while _listeners:
+        _listeners.pop().stop()
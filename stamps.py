@@ -2,6 +2,13 @@ import os
 import random
 import json
 import logging
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List
+
+from logsetup import PER_ITEM
 
 logger = logging.getLogger(__name__)
 
@@ -12,21 +19,110 @@ except Exception:  # pragma: no cover - optional dep
     StampCreator = None  # type: ignore
 
 
+class _StampPreview:
+    """Defers JSON-serializing the stamp preview until the record is formatted."""
+
+    __slots__ = ("stamp_data",)
+
+    def __init__(self, stamp_data: dict) -> None:
+        self.stamp_data = stamp_data
+
+    def __str__(self) -> str:
+        try:
+            return json.dumps({k: self.stamp_data.get(k) for k in ("name", "description")})
+        except Exception:
+            return "<unserializable>"
+
+
+@dataclass
+class StampResult:
+    """Outcome of one item in a `create_stamps` batch."""
+
+    index: int
+    tx_hash: str | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class LocalStampBackend:
+    """Deterministic offline stand-in for a stamping backend.
+
+    Exposes the same `create_stamp` method StampService looks for on a real
+    creator, plus `create_stamps` for whole batches. Each call sleeps for one
+    round trip plus a per-item cost, so batching shows up in benchmarks.
+    Tx ids and failures are derived from a hash of the payload, so the same
+    input always gives the same outcome.
+    """
+
+    # No wallet state, so StampService may submit chunks in parallel
+    concurrency_safe = True
+
+    def __init__(self, latency_ms: float = 50.0, per_item_ms: float = 2.0, failure_rate: float = 0.0) -> None:
+        self.latency_ms = latency_ms
+        self.per_item_ms = per_item_ms
+        self.failure_rate = failure_rate
+
+    @classmethod
+    def from_env(cls) -> "LocalStampBackend":
+        return cls(
+            latency_ms=float(os.getenv("LOCAL_STAMP_LATENCY_MS", "50")),
+            per_item_ms=float(os.getenv("LOCAL_STAMP_PER_ITEM_MS", "2")),
+            failure_rate=float(os.getenv("LOCAL_STAMP_FAILURE_RATE", "0")),
+        )
+
+    def _stamp(self, stamp_data: dict) -> str:
+        digest = hashlib.sha256(json.dumps(stamp_data, sort_keys=True, default=str).encode()).hexdigest()
+        if int(digest[:8], 16) / 0xFFFFFFFF < self.failure_rate:
+            raise RuntimeError("simulated stamping failure")
+        return f"local_tx_{digest}"
+
+    def create_stamp(self, stamp_data: dict) -> str:
+        time.sleep((self.latency_ms + self.per_item_ms) / 1000)
+        return self._stamp(stamp_data)
+
+    def create_stamps(self, batch: List[dict]) -> List[str | Exception]:
+        time.sleep((self.latency_ms + self.per_item_ms * len(batch)) / 1000)
+        results: List[str | Exception] = []
+        for stamp_data in batch:
+            try:
+                results.append(self._stamp(stamp_data))
+            except Exception as e:
+                results.append(e)
+        return results
+
+
 class StampService:
     """Wrapper around btc_stamps with a safe mock fallback.
 
     - If `btcstamps` is installed and a private key is provided, attempts real stamping.
+    - If STAMP_BACKEND=local, uses the offline `LocalStampBackend` instead.
     - If not available and ALLOW_MOCK_STAMP=true (default), returns a mock tx id.
     - If not available and ALLOW_MOCK_STAMP=false, raises RuntimeError.
     """
 
-    def __init__(self, private_key: str | None, network: str = "testnet") -> None:
+    def __init__(
+        self,
+        private_key: str | None,
+        network: str = "testnet",
+        backend: object | None = None,
+        batch_size: int | None = None,
+        max_concurrency: int | None = None,
+    ) -> None:
         self.private_key = private_key
         self.network = network
         self.allow_mock = os.getenv("ALLOW_MOCK_STAMP", "true").lower() == "true"
-        self._creator = None
+        self.batch_size = batch_size or int(os.getenv("STAMP_BATCH_SIZE", "25"))
+        self.max_concurrency = max_concurrency or int(os.getenv("STAMP_MAX_CONCURRENCY", "4"))
+        self._creator = backend
 
-        if StampCreator and private_key:
+        if self._creator is None and os.getenv("STAMP_BACKEND", "").lower() == "local":
+            self._creator = LocalStampBackend.from_env()
+        if self._creator is not None:
+            logger.info("Using stamping backend %s", type(self._creator).__name__)
+        elif StampCreator and private_key:
             try:
                 # StampCreator signature can vary across versions; keep this simple.
                 self._creator = StampCreator(network=network, private_key=private_key)
@@ -60,20 +156,12 @@ class StampService:
           - _creator.inscribe(stamp_data)
           - mock tx if allowed
         """
-        # Serialize minimal stable payload for logging
-        try:
-            log_preview = json.dumps({k: stamp_data.get(k) for k in ("name", "description")})
-            logger.info(f"Stamp request: {log_preview}")
-        except Exception:
-            logger.info("Stamp request: <unserializable>")
+        # Preview is serialized lazily, on the log listener thread
+        logger.info("Stamp request: %s", _StampPreview(stamp_data), extra=PER_ITEM)
 
         if self._creator:
             try:
-                if hasattr(self._creator, "create_stamp"):
-                    return str(self._creator.create_stamp(stamp_data))  # type: ignore
-                if hasattr(self._creator, "inscribe"):
-                    return str(self._creator.inscribe(stamp_data))  # type: ignore
-                raise RuntimeError("btc_stamps creator has no known stamp method")
+                return self._submit_one(stamp_data)
             except Exception as e:  # pragma: no cover
                 logger.error(f"Real stamping failed: {e}")
                 if not self.allow_mock:
@@ -84,6 +172,77 @@ class StampService:
 
         seed = stamp_data.get("attributes", {}).get("seed") or stamp_data.get("seed") or random.randint(1, 1_000_000)
         mock_tx = f"mock_tx_{seed}_{random.randint(100000,999999)}"
-        logger.info(f"Returning mock tx: {mock_tx}")
+        logger.info("Returning mock tx: %s", mock_tx, extra=PER_ITEM)
         return mock_tx
 
+    def _submit_one(self, stamp_data: dict) -> str:
+        """Stamp one item through the configured creator; raises on failure."""
+        if hasattr(self._creator, "create_stamp"):
+            return str(self._creator.create_stamp(stamp_data))  # type: ignore
+        if hasattr(self._creator, "inscribe"):
+            return str(self._creator.inscribe(stamp_data))  # type: ignore
+        raise RuntimeError("btc_stamps creator has no known stamp method")
+
+    def _stamp_chunk(self, chunk: List[dict]) -> List[str | Exception]:
+        """Stamp one chunk with a single backend call where supported."""
+        if self._creator and hasattr(self._creator, "create_stamps"):
+            try:
+                results = list(self._creator.create_stamps(chunk))  # type: ignore
+                if len(results) != len(chunk):
+                    raise RuntimeError(f"backend returned {len(results)} results for {len(chunk)} items")
+                return results
+            except Exception as e:
+                logger.error(f"Batch stamping failed: {e}")
+                return [e] * len(chunk)
+
+        results: List[str | Exception] = []
+        for stamp_data in chunk:
+            try:
+                if self._creator:
+                    results.append(self._submit_one(stamp_data))
+                else:
+                    results.append(self.create_stamp(stamp_data))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def create_stamps(
+        self,
+        batch: List[dict],
+        batch_size: int | None = None,
+        max_concurrency: int | None = None,
+    ) -> List[StampResult]:
+        """Stamp many items and return one `StampResult` per item, in order.
+
+        Items are split into chunks of `batch_size`, and up to
+        `max_concurrency` chunks are in flight at once. Creators that don't
+        set `concurrency_safe = True` (e.g. btc_stamps, which selects UTXOs
+        and signs from a single wallet) always get one chunk at a time.
+        A backend with `create_stamps` gets one call per chunk; otherwise
+        items are stamped one by one. Unlike `create_stamp`, items the
+        backend rejects are reported as errors rather than replaced with
+        mock ids.
+        """
+        size = max(1, batch_size or self.batch_size)
+        workers = max(1, max_concurrency or self.max_concurrency)
+        if self._creator is not None and not getattr(self._creator, "concurrency_safe", False):
+            workers = 1
+        chunks = [batch[i:i + size] for i in range(0, len(batch), size)]
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            chunk_results = list(pool.map(self._stamp_chunk, chunks))
+
+        results: List[StampResult] = []
+        for outcome in (r for chunk in chunk_results for r in chunk):
+            index = len(results)
+            if isinstance(outcome, Exception):
+                results.append(StampResult(index, error=str(outcome) or type(outcome).__name__))
+            else:
+                results.append(StampResult(index, tx_hash=str(outcome)))
+
+        failed = sum(1 for r in results if not r.ok)
+        if failed:
+            logger.warning("Stamped %d/%d items, %d failed", len(results) - failed, len(results), failed)
+        else:
+            logger.info("Stamped %d items in %d chunk(s)", len(results), len(chunks))
+        return results
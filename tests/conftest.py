@@ -0,0 +1,8 @@
+import os
+import tempfile
+
+import logsetup
+
+# Configure logging before `backend` is imported so test runs don't write
+# to the repo's logs/app.log.
+logsetup.setup_logging(log_path=os.path.join(tempfile.mkdtemp(prefix="hexaflock-logs-"), "app.log"))
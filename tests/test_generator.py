@@ -1,12 +1,20 @@
+import json
+import logging
 import os
 import re
+import subprocess
+import sys
+import threading
+import time
 
 import pytest
 
+import backend
+import batch_generate
 from backend import generate_hexa_flock, resolve_traits
 from PIL import Image
 import io
-from stamps import StampService
+from stamps import LocalStampBackend, StampService
 
 
 def test_generate_valid_seed():
@@ -37,7 +45,174 @@ def test_mock_stamp_returns_txid(monkeypatch):
     assert re.match(r"^mock_tx_99_\d{6}$", tx)
 
 
+def test_create_stamps_reports_partial_failures():
+    local = LocalStampBackend(latency_ms=0, per_item_ms=0, failure_rate=0.5)
+    svc = StampService(private_key=None, backend=local, batch_size=3, max_concurrency=2)
+    batch = [{"attributes": {"seed": i}} for i in range(10)]
+    results = svc.create_stamps(batch)
+    assert [r.index for r in results] == list(range(10))
+    assert any(r.ok for r in results) and any(not r.ok for r in results)
+    assert all(r.tx_hash.startswith("local_tx_") for r in results if r.ok)
+    assert all(r.error and r.tx_hash is None for r in results if not r.ok)
+    # Same payloads give the same outcomes
+    assert svc.create_stamps(batch) == results
+
+
+def test_create_stamps_mock_path(monkeypatch):
+    monkeypatch.setenv("ALLOW_MOCK_STAMP", "true")
+    monkeypatch.delenv("STAMP_BACKEND", raising=False)
+    svc = StampService(private_key=None, network="testnet")
+    results = svc.create_stamps([{"attributes": {"seed": s}} for s in (5, 6)], batch_size=1)
+    assert [r.ok for r in results] == [True, True]
+    assert re.match(r"^mock_tx_6_\d{6}$", results[1].tx_hash)
+
+
+def test_create_stamps_serializes_creators_not_marked_concurrency_safe():
+    class WalletCreator:
+        def __init__(self) -> None:
+            self.active = 0
+            self.peak = 0
+            self.lock = threading.Lock()
+
+        def create_stamp(self, stamp_data: dict) -> str:
+            with self.lock:
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+            time.sleep(0.01)
+            with self.lock:
+                self.active -= 1
+            return f"tx_{stamp_data['attributes']['seed']}"
+
+    creator = WalletCreator()
+    svc = StampService(private_key=None, backend=creator, batch_size=1, max_concurrency=4)
+    results = svc.create_stamps([{"attributes": {"seed": i}} for i in range(6)])
+    assert [r.tx_hash for r in results] == [f"tx_{i}" for i in range(6)]
+    assert creator.peak == 1
+
+
+def test_stamp_rendered_writes_meta_and_counts_failures(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("flocks")
+    local = LocalStampBackend(latency_ms=0, per_item_ms=0, failure_rate=0.5)
+    monkeypatch.setattr(batch_generate, "stamp_service", StampService(private_key=None, backend=local))
+
+    rendered = [batch_generate.render_seed(seed) for seed in range(1, 9)]
+    failed = batch_generate.stamp_rendered(rendered, batch_size=3, max_concurrency=2)
+
+    metas = [json.loads((tmp_path / "flocks" / f"meta_{seed}.json").read_text()) for seed in range(1, 9)]
+    assert (tmp_path / "flocks" / "flock_1.png").exists()
+    assert failed == sum(1 for m in metas if "stamp_error" in m)
+    assert 0 < failed < 8
+    assert all(m["tx_hash"].startswith("local_tx_") for m in metas if "stamp_error" not in m)
+    assert all(m["tx_hash"] is None for m in metas if "stamp_error" in m)
+
+
 def test_traits_determinism():
     t1 = resolve_traits(123)
     t2 = resolve_traits(123)
     assert t1.__dict__ == t2.__dict__
+
+
+def test_generate_bulk_streams_ndjson_with_per_item_errors():
+    txid = "ab" * 32
+    resp = backend.app.test_client().post("/generate_bulk", json={"txids": [txid, "not-a-txid"]})
+    assert resp.status_code == 200
+    assert resp.mimetype == "application/x-ndjson"
+    lines = [json.loads(line) for line in resp.get_data(as_text=True).splitlines()]
+    assert [line["index"] for line in lines] == [0, 1]
+    assert lines[0]["metadata"]["source_txid"] == txid
+    assert lines[0]["image_base64"]
+    assert "error" in lines[1]
+
+
+def test_generate_bulk_seed_range_and_limits(monkeypatch):
+    client = backend.app.test_client()
+    resp = client.post("/generate_bulk", json={"seed_start": 5, "count": 3})
+    seeds = [json.loads(line)["metadata"]["seed"] for line in resp.get_data(as_text=True).splitlines()]
+    assert seeds == [5, 6, 7]
+
+    monkeypatch.setattr(backend, "BULK_MAX_ITEMS", 2)
+    resp = client.post("/generate_bulk", json={"seed_start": 1, "count": 3})
+    assert resp.status_code == 400
+
+
+def test_generate_bulk_stops_submitting_when_client_disconnects(monkeypatch):
+    pool = backend._get_bulk_pool()
+    submitted = []
+
+    class CountingPool:
+        def apply_async(self, func, args):
+            submitted.append(args)
+            return pool.apply_async(func, args)
+
+    monkeypatch.setattr(backend, "_get_bulk_pool", lambda: CountingPool())
+    monkeypatch.setattr(backend, "BULK_CHUNKSIZE", 1)
+    monkeypatch.setattr(backend, "BULK_WINDOW", 2)
+    resp = backend.app.test_client().post("/generate_bulk", json={"seed_start": 1, "count": 50}, buffered=False)
+    first = next(iter(resp.response))
+    resp.close()
+    assert json.loads(first)["metadata"]["seed"] == 1
+    assert len(submitted) == 2
+
+
+def test_generate_bulk_item_errors_reach_parent_log(monkeypatch):
+    import logsetup
+
+    class ListHandler(logging.Handler):
+        def __init__(self) -> None:
+            super().__init__()
+            self.messages = []
+
+        def emit(self, record: logging.LogRecord) -> None:
+            self.messages.append(record.getMessage())
+
+    def flaky_generate(seed: int, size: int = 64):
+        if seed == 2:
+            raise RuntimeError("boom")
+        return generate_hexa_flock(seed, size)
+
+    # Fork a fresh pool that sees the patch and logs to the capture handler
+    backend._shutdown_bulk_pool()
+    capture = ListHandler()
+    logsetup._handlers.append(capture)
+    monkeypatch.setattr(backend, "generate_hexa_flock", flaky_generate)
+    backend._get_bulk_pool()
+    listener = logsetup._listeners[-1]
+    try:
+        resp = backend.app.test_client().post("/generate_bulk", json={"seed_start": 1, "count": 3})
+        lines = [json.loads(line) for line in resp.get_data(as_text=True).splitlines()]
+        assert lines[1]["error"] == "Internal error"
+
+        deadline = time.monotonic() + 10
+        while not any("bulk item 1 failed" in m for m in capture.messages) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert any("bulk item 1 failed: boom" in m for m in capture.messages)
+        assert listener._thread is not None and listener._thread.is_alive()
+    finally:
+        backend._shutdown_bulk_pool()
+        logsetup._listeners.remove(listener)
+        listener.stop()
+        logsetup._handlers.remove(capture)
+
+
+def test_batch_generate_main_multiprocess_smoke(tmp_path):
+    # Enough worker records to overflow a pipe buffer: if nothing drains the
+    # log queue, worker exit blocks and the batch never completes.
+    script = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "batch_generate.py")
+    env = {
+        **os.environ,
+        "STAMP_BACKEND": "local",
+        "LOCAL_STAMP_LATENCY_MS": "0",
+        "LOCAL_STAMP_PER_ITEM_MS": "0",
+        "LOG_LEVEL": "INFO",
+        "LOG_ITEM_SAMPLE": "1",
+    }
+    proc = subprocess.run(
+        [sys.executable, script, "--num", "600", "--processes", "2"],
+        cwd=tmp_path, env=env, capture_output=True, timeout=120,
+    )
+    assert proc.returncode == 0, proc.stderr.decode()[-2000:]
+    log = (tmp_path / "logs" / "app.log").read_text()
+    assert log.count("Generated sheep seed=") == 600
+    assert "Batch complete: 600 flocks, 0 stamp failures" in log
+    assert len(list((tmp_path / "flocks").glob("meta_*.json"))) == 600
@@ -0,0 +1,92 @@
+import logging
+import multiprocessing
+import queue
+
+import logsetup
+from logsetup import PER_ITEM, ItemSampler, _LocalQueueHandler, init_worker, worker_queue
+
+
+def _record(level: int, per_item: bool) -> logging.LogRecord:
+    logger = logging.getLogger("test_logsetup")
+    extra = PER_ITEM if per_item else None
+    return logger.makeRecord(logger.name, level, __file__, 0, "seed=%d", (1,), None, extra=extra)
+
+
+def test_item_sampler_keeps_one_in_n():
+    sampler = ItemSampler(every=4)
+    kept = [sampler.filter(_record(logging.INFO, True)) for _ in range(12)]
+    assert sum(kept) == 3
+
+
+def test_item_sampler_passes_warnings_and_untagged():
+    sampler = ItemSampler(every=1000)
+    sampler.filter(_record(logging.INFO, True))  # consume the sampled slot
+    assert sampler.filter(_record(logging.WARNING, True))
+    assert sampler.filter(_record(logging.INFO, False))
+    assert not sampler.filter(_record(logging.INFO, True))
+
+
+def test_local_queue_handler_defers_formatting():
+    q = queue.SimpleQueue()
+    _LocalQueueHandler(q).handle(_record(logging.INFO, False))
+    rec = q.get_nowait()
+    assert rec.msg == "seed=%d" and rec.args == (1,)
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.records = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+def _log_from_worker(n: int) -> list:
+    import backend  # noqa: F401 - under spawn this re-runs setup_logging()
+
+    logging.getLogger("test_logsetup.worker").warning("worker record %d", n)
+    return [type(h).__name__ for h in logging.getLogger().handlers]
+
+
+def test_worker_records_reach_parent_handlers_under_spawn():
+    capture = _ListHandler()
+    logsetup._handlers.append(capture)
+    try:
+        ctx = multiprocessing.get_context("spawn")
+        q = worker_queue(ctx)
+        listener = logsetup._listeners[-1]
+        with ctx.Pool(processes=2, initializer=init_worker, initargs=(q,)) as pool:
+            handler_names = pool.map(_log_from_worker, range(4))
+            pool.close()
+            pool.join()
+        logsetup._listeners.remove(listener)
+        listener.stop()
+    finally:
+        logsetup._handlers.remove(capture)
+
+    assert all(names == ["QueueHandler"] for names in handler_names)
+    messages = sorted(r.getMessage() for r in capture.records if r.name == "test_logsetup.worker")
+    assert messages == [f"worker record {n}" for n in range(4)]
+
+
+def test_worker_records_reach_parent_handlers_under_fork():
+    capture = _ListHandler()
+    logsetup._handlers.append(capture)
+    try:
+        ctx = multiprocessing.get_context("fork")
+        q = worker_queue(ctx)
+        listener = logsetup._listeners[-1]
+        for _ in range(2):
+            with ctx.Pool(processes=2, initializer=init_worker, initargs=(q,)) as pool:
+                pool.map(_log_from_worker, range(4))
+                pool.close()
+                pool.join()
+        assert listener._thread is not None and listener._thread.is_alive()
+        logsetup._listeners.remove(listener)
+        listener.stop()
+    finally:
+        logsetup._handlers.remove(capture)
+
+    messages = sorted(r.getMessage() for r in capture.records if r.name == "test_logsetup.worker")
+    assert messages == sorted(f"worker record {n}" for n in range(4) for _ in range(2))